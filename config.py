@@ -12,4 +12,5 @@ class ConciergeConfig:
     model_name: str = "gemini-2.5-flash"
     max_retries: int = 3
     memory_retention_days: int = 30  # For MemoryBank
+    eval_concurrency: int = 4  # Scenarios run in parallel by the eval suite
 config = ConciergeConfig()
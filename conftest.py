@@ -0,0 +1,17 @@
+import pytest
+
+# Shared agent instance (construction is heavy; reuse across the whole session).
+# Imported lazily so tests that don't use the agent don't need Gemini/ADK auth.
+@pytest.fixture(scope="session")
+def _shared_agent():
+    from concierge_agent.agent import OrchestrationAgent
+    return OrchestrationAgent()
+
+@pytest.fixture
+def agent(_shared_agent):
+    """Shared agent with fresh session and memory state, so tests stay isolated."""
+    from google_adk.sessions import InMemorySessionService
+    from concierge_agent.memory import MemoryBank
+    _shared_agent.session_service = InMemorySessionService()
+    _shared_agent.memory_bank = MemoryBank()
+    return _shared_agent
@@ -1,10 +1,32 @@
 import json
-import pandas as pd
-from typing import Dict, List, Any
+import numpy as np
+from typing import Dict, List, Any, Callable, Collection, Optional, Tuple
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
 import re
+import threading
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json module
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional: falls back to per-keyword substring checks
+    ahocorasick = None
+
+# Shared vectorizer; fit_transform mutates it, so every fit must hold the lock
+_VECTORIZER = TfidfVectorizer(stop_words='english', lowercase=True, dtype=np.float32)
+_VECTORIZER_LOCK = threading.Lock()
+
+_HASHTAG_RE = re.compile(r"#\w+")
+_EMOJI_RE = re.compile(r"[\U0001F300-\U0001F9FF\U0001F600-\U0001F64F]")
+
+@lru_cache(maxsize=512)
+def _compile_ci(pattern: str) -> re.Pattern:
+    return re.compile(pattern, re.IGNORECASE)
 
 @dataclass
 class EvaluationResult:
@@ -17,9 +39,40 @@ class EvaluationResult:
     overall_score: float
     passed: bool
 
+@dataclass
+class RunningSummary:
+    """Evaluation summary (see compute_overall_score), updated one result at a time."""
+    total_scenarios: int = 0
+    pass_count: int = 0
+    score_sum: float = 0.0
+    best: Optional[EvaluationResult] = field(default=None, repr=False)
+    worst: Optional[EvaluationResult] = field(default=None, repr=False)
+
+    def add(self, result: EvaluationResult) -> None:
+        self.total_scenarios += 1
+        self.pass_count += bool(result.passed)
+        self.score_sum += result.overall_score
+        if self.best is None or result.overall_score > self.best.overall_score:
+            self.best = result
+        if self.worst is None or result.overall_score < self.worst.overall_score:
+            self.worst = result
+
+    def as_dict(self) -> Dict[str, Any]:
+        n = self.total_scenarios
+        return {
+            "total_scenarios": n,
+            "pass_rate": self.pass_count / n if n else 0.0,
+            "avg_overall_score": self.score_sum / n if n else 0.0,
+            "best_scenario": self.best.scenario if self.best else "N/A",
+            "worst_scenario": self.worst.scenario if self.worst else "N/A"
+        }
+
 def load_evaluation_dataset(path: str = "data/evaluation_dataset.json") -> List[Dict]:
     """Load ground-truth scenarios for evaluation."""
     try:
+        if orjson is not None:
+            with open(path, "rb") as f:
+                return orjson.loads(f.read())
         with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
     except FileNotFoundError:
@@ -52,46 +105,99 @@ def load_evaluation_dataset(path: str = "data/evaluation_dataset.json") -> List[
             }
         ]
 
+def result_to_json_line(result: EvaluationResult) -> bytes:
+    """One newline-terminated JSON record for the streamed results file."""
+    if orjson is not None:
+        return orjson.dumps(asdict(result)) + b"\n"
+    return (json.dumps(asdict(result)) + "\n").encode("utf-8")
+
 def cosine_text_similarity(text1: str, text2: str) -> float:
-    vectorizer = TfidfVectorizer(stop_words='english', lowercase=True)
     try:
-        tfidf = vectorizer.fit_transform([text1, text2])
-        return float(cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0])
+        with _VECTORIZER_LOCK:
+            tfidf = _VECTORIZER.fit_transform([text1, text2])
+        # Rows are already L2-normalised by TfidfVectorizer, so cosine is the dot product
+        return float(tfidf[0].multiply(tfidf[1]).sum())
     except:
         return 0.0
 
+def cosine_text_similarity_batch(pairs: List[Tuple[str, str]]) -> List[float]:
+    """Cosine similarity for many text pairs using a single TF-IDF fit."""
+    if not pairs:
+        return []
+    all_texts = [text for pair in pairs for text in pair]
+    try:
+        with _VECTORIZER_LOCK:
+            tfidf = _VECTORIZER.fit_transform(all_texts)
+    except ValueError:
+        # Empty vocabulary (e.g. only stop words)
+        return [0.0] * len(pairs)
+    sims = tfidf[0::2].multiply(tfidf[1::2]).sum(axis=1)
+    return [float(s) for s in np.asarray(sims).ravel()]
+
+# Bound search method per pattern, as returned by compile_patterns
+CompiledPatterns = Tuple[Callable[[str], Optional[re.Match]], ...]
+
+@lru_cache(maxsize=256)
+def _compile_pattern_seq(patterns: Tuple[str, ...]) -> CompiledPatterns:
+    return tuple(_compile_ci(p).search for p in patterns)
+
+def compile_patterns(patterns: List[str]) -> CompiledPatterns:
+    """Compile patterns once for compiled_match_score; shared across equal pattern lists."""
+    return _compile_pattern_seq(tuple(patterns))
+
+def compiled_match_score(text: str, compiled: CompiledPatterns) -> float:
+    return sum(1 for search in compiled if search(text)) / max(len(compiled), 1)
+
 def regex_match_score(text: str, patterns: List[str]) -> float:
-    score = 0
-    for pattern in patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            score += 1
-    return score / max(len(patterns), 1)
+    return compiled_match_score(text, _compile_pattern_seq(tuple(patterns)))
+
+def build_keyword_matcher(expected_keywords_lower: Collection[str]) -> Any:
+    """Aho-Corasick automaton over the keywords, or None if pyahocorasick is unavailable."""
+    keywords = {kw for kw in expected_keywords_lower if kw}
+    if ahocorasick is None or not keywords:
+        return None
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
+
+# Weights for (keyword coverage, length ok, has hashtag, has emoji)
+_POST_QUALITY_WEIGHTS = (0.3, 0.3, 0.2, 0.2)
+
+def evaluate_social_post_features(post: str, expected_keywords_lower: Collection[str], keyword_matcher: Any = None) -> Tuple[float, float, float, float]:
+    """Raw (keyword coverage, length ok, has hashtag, has emoji) features of a post.
+
+    Keywords (a list or set) are expected to be lowercased by the caller; both the
+    automaton and the substring path count each distinct non-empty keyword once.
+    """
+    post_lower = post.lower()
+    length_ok = 50 <= len(post_lower.split()) <= 280
+    has_hashtag = "#" in post and _HASHTAG_RE.search(post) is not None
+    # isascii() is a flag check in CPython, so ASCII-only posts skip the scan entirely
+    has_emoji = not post.isascii() and _EMOJI_RE.search(post) is not None
+    keywords = {kw for kw in expected_keywords_lower if kw}
+    if keyword_matcher is not None:
+        keyword_hits = len({kw for _, kw in keyword_matcher.iter(post_lower)})
+    else:
+        keyword_hits = sum(1 for kw in keywords if kw in post_lower)
+    keyword_score = keyword_hits / max(len(keywords), 1)
+    return keyword_score, float(length_ok), float(has_hashtag), float(has_emoji)
+
+def average_post_quality(features: List[Tuple[float, float, float, float]]) -> float:
+    """Weighted quality of each post's features, averaged over the posts."""
+    if not features:
+        return 0.0
+    qualities = np.asarray(features, dtype=np.float64) @ np.asarray(_POST_QUALITY_WEIGHTS)
+    return float(qualities.mean())
 
 def evaluate_social_post(post: str, expected_keywords: List[str]) -> Dict[str, float]:
-    length_ok = 50 <= len(post.split()) <= 280
-    has_hashtag = bool(re.search(r"#\w+", post))
-    has_emoji = bool(re.search(r"[\U0001F300-\U0001F9FF]|[\U0001F600-\U0001F64F]", post))
-    keyword_score = sum(1 for kw in expected_keywords if kw.lower() in post.lower()) / len(expected_keywords)
-    
-    quality = (
-        0.3 * keyword_score +
-        0.3 * (1 if length_ok else 0) +
-        0.2 * (1 if has_hashtag else 0) +
-        0.2 * (1 if has_emoji else 0)
-    )
-    return {"quality": quality, "keyword_coverage": keyword_score}
+    features = evaluate_social_post_features(post, [kw.lower() for kw in expected_keywords])
+    quality = sum(w * f for w, f in zip(_POST_QUALITY_WEIGHTS, features))
+    return {"quality": quality, "keyword_coverage": features[0]}
 
 def compute_overall_score(results: List[EvaluationResult]) -> Dict[str, float]:
-    df = pd.DataFrame([{
-        "scenario": r.scenario,
-        "overall": r.overall_score,
-        "passed": r.passed
-    } for r in results])
-    
-    return {
-        "total_scenarios": len(df),
-        "pass_rate": df["passed"].mean(),
-        "avg_overall_score": df["overall"].mean(),
-        "best_scenario": df.loc[df["overall"].idxmax(), "scenario"] if not df.empty else "N/A",
-        "worst_scenario": df.loc[df["overall"].idxmin(), "scenario"] if not df.empty else "N/A"
-    }
\ No newline at end of file
+    summary = RunningSummary()
+    for r in results:
+        summary.add(r)
+    return summary.as_dict()
@@ -1,100 +1,128 @@
 import pytest
 import asyncio
-import json
+import numpy as np
 from typing import Dict, Any
-from concierge_agent.agent import OrchestrationAgent
+from concierge_agent.config import config
 from eval.evaluation_utils import (
-    load_evaluation_dataset, cosine_text_similarity,
-    regex_match_score, evaluate_social_post, EvaluationResult,
-    compute_overall_score
+    load_evaluation_dataset, cosine_text_similarity_batch,
+    compile_patterns, compiled_match_score, evaluate_social_post_features, average_post_quality,
+    build_keyword_matcher, EvaluationResult,
+    RunningSummary, result_to_json_line
 )
 
-# Global agent instance (reuse to avoid reinitialization)
-@pytest.fixture(scope="module")
-def agent():
-    return OrchestrationAgent()
+# Overall score weights: relevance, personalization, trend, event, post quality
+_METRIC_WEIGHTS = np.array([0.25, 0.20, 0.15, 0.15, 0.25])
 
 @pytest.mark.asyncio
 @pytest.mark.evaluation
 async def test_full_evaluation_suite(agent):
     """Run full evaluation against golden dataset."""
     dataset = load_evaluation_dataset()
-    results = []
+    running = RunningSummary()
     
     print("\nConcierge AI Agent — Evaluation Report")
     print("=" * 60)
     
-    for item in dataset:
-        user_input = item["user_input"]
-        expected = item["expected"]
-        
-        print(f"\nScenario {item['id']}: {user_input[:70]}{'...' if len(user_input)>70 else ''}")
-        
-        try:
-            # Run the actual agent
-            output = await asyncio.wait_for(agent.run(user_input), timeout=60)
-        except Exception as e:
-            print(f"   Failed: {e}")
-            results.append(EvaluationResult(
-                scenario=user_input[:50],
-                relevance_score=0, personalization_score=0,
-                trend_alignment=0, event_coverage=0,
-                post_quality_avg=0, overall_score=0, passed=False
-            ))
+    # Run the agent for every scenario concurrently; scoring below is CPU-only
+    sem = asyncio.Semaphore(config.eval_concurrency)
+    
+    async def run_one(item):
+        async with sem:
+            return await asyncio.wait_for(agent.run(item["user_input"]), timeout=60)
+    
+    outputs = await asyncio.gather(*[run_one(item) for item in dataset], return_exceptions=True)
+    
+    # Extract outputs
+    extracted = []
+    for output in outputs:
+        if isinstance(output, BaseException):
+            extracted.append(None)
             continue
-        
-        # Extract outputs
         recommendations = output.get("recommendations", {})
         promotions = output.get("promotions", [])
         social_posts = output.get("social_posts", {})
         
         rec_text = recommendations.get("suggestions", "") if isinstance(recommendations, dict) else str(recommendations)
         promo_text = " | ".join([f"{p.get('offer','')} {p.get('discount','')}" for p in promotions])
+        extracted.append((rec_text, promo_text, social_posts))
+    
+    def score_metrics(expected, social_posts):
+        """Personalization, trend, event and post-quality scores for one scenario."""
         all_posts = " ".join(social_posts.values())
+        # Empty outputs score 0 without touching the regex code
+        post_features = []
+        if social_posts:
+            # Lowercased once per scenario; a set so repeated keywords count once
+            keywords_lower = {kw.lower() for kw in expected.get("required_keywords", [])}
+            keyword_matcher = build_keyword_matcher(keywords_lower)
+            post_features = [
+                evaluate_social_post_features(post, keywords_lower, keyword_matcher)
+                for post in social_posts.values()
+            ]
+        if all_posts.strip():
+            # Compiled once per scenario (and reused by scenarios sharing a pattern list)
+            persona_re = compile_patterns([
+                expected.get("age_group", ""), 
+                expected.get("gender", ""), 
+                expected.get("market", "Singapore|US")
+            ])
+            personalization = compiled_match_score(all_posts, persona_re)
+            trend_align = compiled_match_score(all_posts, compile_patterns(expected.get("trends", [])))
+            event_cov = compiled_match_score(all_posts, compile_patterns(expected.get("events", [])))
+        else:
+            personalization = trend_align = event_cov = 0.0
         
-        # Scoring
-        relevance = cosine_text_similarity(user_input + " " + rec_text + promo_text, user_input)
-        personalization = regex_match_score(all_posts, [
-            expected.get("age_group", ""), 
-            expected.get("gender", ""), 
-            expected.get("market", "Singapore|US")
-        ])
-        trend_align = regex_match_score(all_posts, expected.get("trends", []))
-        event_cov = regex_match_score(all_posts, expected.get("events", []))
-        
-        post_qualities = [
-            evaluate_social_post(post, expected.get("required_keywords", []))["quality"]
-            for post in social_posts.values()
+        return [personalization, trend_align, event_cov, average_post_quality(post_features)]
+    
+    # One row per scenario, columns in _METRIC_WEIGHTS order; failed scenarios stay all-zero
+    scores = np.zeros((len(dataset), len(_METRIC_WEIGHTS)))
+    
+    relevance_rows = [i for i, texts in enumerate(extracted) if texts is not None and (texts[0] or texts[1])]
+    scores[relevance_rows, 0] = cosine_text_similarity_batch([
+        (dataset[i]["user_input"] + " " + extracted[i][0] + extracted[i][1], dataset[i]["user_input"])
+        for i in relevance_rows
+    ])
+    
+    scored_rows = [i for i, texts in enumerate(extracted) if texts is not None]
+    if scored_rows:
+        scores[scored_rows, 1:] = [
+            score_metrics(dataset[i]["expected"], extracted[i][2]) for i in scored_rows
         ]
-        post_quality_avg = sum(post_qualities) / len(post_qualities) if post_qualities else 0
-        
-        overall = (
-            0.25 * relevance +
-            0.20 * personalization +
-            0.15 * trend_align +
-            0.15 * event_cov +
-            0.25 * post_quality_avg
-        )
-        
-        passed = overall >= 0.75
-        
-        result = EvaluationResult(
-            scenario=user_input[:50],
-            relevance_score=round(relevance, 3),
-            personalization_score=round(personalization, 3),
-            trend_alignment=round(trend_align, 3),
-            event_coverage=round(event_cov, 3),
-            post_quality_avg=round(post_quality_avg, 3),
-            overall_score=round(overall, 3),
-            passed=passed
-        )
-        results.append(result)
-        
-        status = "PASSED" if passed else "FAILED"
-        print(f"   → Overall: {overall:.3f} | Post Quality: {post_quality_avg:.3f} | [{status}]")
+    
+    overall_scores = scores @ _METRIC_WEIGHTS
+    passed_mask = overall_scores >= 0.75
+    
+    # Write results one line at a time; the summary is reduced online instead of from a list of results
+    with open("eval_results.jsonl", "wb") as results_file:
+        for i, (item, output, texts) in enumerate(zip(dataset, outputs, extracted)):
+            user_input = item["user_input"]
+            relevance, personalization, trend_align, event_cov, post_quality_avg = scores[i].tolist()
+            overall = float(overall_scores[i])
+            passed = bool(passed_mask[i])
+            
+            print(f"\nScenario {item['id']}: {user_input[:70]}{'...' if len(user_input)>70 else ''}")
+            
+            result = EvaluationResult(
+                scenario=user_input[:50],
+                relevance_score=round(relevance, 3),
+                personalization_score=round(personalization, 3),
+                trend_alignment=round(trend_align, 3),
+                event_coverage=round(event_cov, 3),
+                post_quality_avg=round(post_quality_avg, 3),
+                overall_score=round(overall, 3),
+                passed=passed
+            )
+            results_file.write(result_to_json_line(result))
+            running.add(result)
+            
+            if texts is None:
+                print(f"   Failed: {output}")
+                continue
+            status = "PASSED" if passed else "FAILED"
+            print(f"   → Overall: {overall:.3f} | Post Quality: {post_quality_avg:.3f} | [{status}]")
     
     # Final Summary
-    summary = compute_overall_score(results)
+    summary = running.as_dict()
     print("\n" + "=" * 60)
     print("FINAL EVALUATION SUMMARY")
     print("=" * 60)
@@ -105,10 +133,6 @@ async def test_full_evaluation_suite(agent):
     print(f"Worst:           {summary['worst_scenario']}")
     print("=" * 60)
     
-    # Save detailed results
-    with open("eval_results.json", "w") as f:
-        json.dump([r.__dict__ for r in results], f, indent=2)
-    
     # Final assertion for CI/CD
     assert summary['pass_rate'] >= 0.7, f"Evaluation failed: Only {summary['pass_rate']:.1%} passed (need ≥70%)"
 
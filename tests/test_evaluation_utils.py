@@ -0,0 +1,176 @@
+import re
+import json
+import dataclasses
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from eval import evaluation_utils
+from eval.evaluation_utils import (
+    regex_match_score, compile_patterns, compiled_match_score,
+    cosine_text_similarity, cosine_text_similarity_batch,
+    EvaluationResult, RunningSummary, compute_overall_score,
+    build_keyword_matcher, evaluate_social_post_features, evaluate_social_post,
+    result_to_json_line, load_evaluation_dataset, average_post_quality
+)
+
+POSTS = "Holiday deals: After Christmas Sale and New Year bundles for women in Singapore"
+
+def _baseline_score(text, patterns):
+    """Original per-pattern re.search loop the optimized scorers must agree with."""
+    return sum(1 for p in patterns if re.search(p, text, re.IGNORECASE)) / max(len(patterns), 1)
+
+@pytest.mark.parametrize("patterns", [
+    ["Christmas", "After Christmas Sale", "New Year"],  # overlapping matches
+    ["20-40", "women", "Singapore|US"],
+    ["", "", "Singapore|US"],  # missing age_group/gender fall back to ""
+    ["floral", "gift set", "sustainable"],
+    [],
+])
+def test_regex_match_score_matches_baseline(patterns):
+    assert regex_match_score(POSTS, patterns) == _baseline_score(POSTS, patterns)
+
+def test_regex_match_score_is_case_insensitive():
+    assert regex_match_score("BLACK FRIDAY deals", ["black friday", "12.12"]) == 0.5
+
+def test_compiled_match_score_reuses_compiled_patterns():
+    compiled = compile_patterns(["Christmas", "New Year"])
+    assert compile_patterns(["Christmas", "New Year"]) is compiled
+    assert compiled_match_score(POSTS, compiled) == 1.0
+    assert compiled_match_score("nothing relevant", compiled) == 0.0
+
+@pytest.mark.parametrize("patterns", [
+    ["", "", "Singapore|US"],  # scenario 2 persona list: duplicates must keep their weight
+    ["New Year", "Christmas", "New Year"],
+    ["floral", "gift set", "sustainable", "long-lasting"],
+])
+@pytest.mark.parametrize("text", [POSTS, "Perfume gifts for her", ""])
+def test_compiled_match_score_matches_regex_match_score(patterns, text):
+    assert compiled_match_score(text, compile_patterns(patterns)) == regex_match_score(text, patterns)
+
+def _result(name, overall, passed):
+    return EvaluationResult(
+        scenario=name, relevance_score=0, personalization_score=0,
+        trend_alignment=0, event_coverage=0, post_quality_avg=0,
+        overall_score=overall, passed=passed
+    )
+
+def test_running_summary_empty():
+    assert RunningSummary().as_dict() == {
+        "total_scenarios": 0, "pass_rate": 0.0, "avg_overall_score": 0.0,
+        "best_scenario": "N/A", "worst_scenario": "N/A"
+    }
+
+def test_running_summary_tracks_rates_and_first_best_worst():
+    results = [_result("a", 0.5, False), _result("b", 0.9, True), _result("c", 0.9, True), _result("d", 0.1, False)]
+    summary = RunningSummary()
+    for r in results:
+        summary.add(r)
+    assert summary.as_dict() == pytest.approx({
+        "total_scenarios": 4, "pass_rate": 0.5, "avg_overall_score": 0.6,
+        "best_scenario": "b", "worst_scenario": "d"
+    })
+    assert compute_overall_score(results) == summary.as_dict()
+
+@pytest.mark.parametrize("keywords", [
+    {"", "gift", "holiday"},  # empty keyword must not count as a hit
+    {"gift", "bundle", "scent"},
+    {""},
+    ["gift", "gift"],  # lists may repeat keywords; each distinct one counts once
+    ["gift", "scent", "gift", ""],
+])
+def test_keyword_coverage_same_with_and_without_matcher(keywords):
+    post = "Holiday gift bundles for her"
+    matcher = build_keyword_matcher(keywords)
+    with_matcher = evaluate_social_post_features(post, keywords, matcher)[0]
+    assert with_matcher == evaluate_social_post_features(post, keywords)[0]
+
+def test_keyword_coverage_ignores_empty_keywords():
+    assert evaluate_social_post_features("Holiday gift bundles", {"", "gift", "scent"})[0] == 0.5
+
+def test_keyword_coverage_counts_repeated_keywords_once():
+    assert evaluate_social_post_features("gift", ["gift", "gift"])[0] == 1.0
+    assert evaluate_social_post_features("gift", ["gift", "gift"], build_keyword_matcher(["gift", "gift"]))[0] == 1.0
+
+def test_evaluate_social_post_accepts_mixed_case_keywords():
+    score = evaluate_social_post("Christmas perfume", ["Christmas"])
+    assert score["keyword_coverage"] == 1.0
+    assert score["quality"] == pytest.approx(0.3)
+
+COSINE_PAIRS = [
+    ("Perfume promotion for Christmas and New Year, women 25-35 in US Holiday perfume bundles", "Perfume promotion for Christmas and New Year, women 25-35 in US"),
+    ("Floral gift sets for women in Singapore this Black Friday", "women in Singapore"),
+    ("Sustainable long-lasting scents", "discount bundles"),
+]
+
+def _sklearn_cosines(pairs):
+    """Reference: independent TF-IDF fit over all texts, then sklearn's cosine_similarity."""
+    tfidf = TfidfVectorizer(stop_words='english', lowercase=True).fit_transform([t for pair in pairs for t in pair])
+    return [float(cosine_similarity(tfidf[2 * i:2 * i + 1], tfidf[2 * i + 1:2 * i + 2])[0][0]) for i in range(len(pairs))]
+
+@pytest.mark.parametrize("pair", COSINE_PAIRS)
+def test_cosine_text_similarity_matches_sklearn(pair):
+    assert cosine_text_similarity(*pair) == pytest.approx(_sklearn_cosines([pair])[0], abs=1e-6)
+
+def test_cosine_text_similarity_batch_matches_sklearn():
+    assert cosine_text_similarity_batch(COSINE_PAIRS) == pytest.approx(_sklearn_cosines(COSINE_PAIRS), abs=1e-6)
+
+def test_cosine_text_similarity_batch_handles_empty_and_stop_word_input():
+    assert cosine_text_similarity_batch([]) == []
+    assert cosine_text_similarity_batch([("the and", "of the")]) == [0.0]
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(evaluation_utils, "orjson", None)
+    return request.param
+
+def test_result_to_json_line_round_trips(json_backend, tmp_path):
+    results = [_result("Perfume — holiday 🎉", 0.812, True), _result("b", 0.0, False)]
+    path = tmp_path / "eval_results.jsonl"
+    with open(path, "wb") as f:
+        for r in results:
+            f.write(result_to_json_line(r))
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [dataclasses.asdict(r) for r in results]
+
+def test_load_evaluation_dataset_round_trips(json_backend, tmp_path):
+    dataset = [{"id": 1, "user_input": "Perfume for women in Singapore 🎄", "expected": {"events": ["Christmas", "12.12"]}}]
+    path = tmp_path / "evaluation_dataset.json"
+    path.write_text(json.dumps(dataset, ensure_ascii=False), encoding="utf-8")
+    assert load_evaluation_dataset(str(path)) == dataset
+
+def test_load_evaluation_dataset_falls_back_when_missing(json_backend, tmp_path):
+    dataset = load_evaluation_dataset(str(tmp_path / "missing.json"))
+    assert [item["id"] for item in dataset] == [1, 2]
+
+def _baseline_quality(post, expected_keywords):
+    """Original evaluate_social_post quality formula."""
+    length_ok = 50 <= len(post.split()) <= 280
+    has_hashtag = bool(re.search(r"#\w+", post))
+    has_emoji = bool(re.search(r"[\U0001F300-\U0001F9FF]|[\U0001F600-\U0001F64F]", post))
+    keyword_score = sum(1 for kw in expected_keywords if kw.lower() in post.lower()) / len(expected_keywords)
+    return 0.3 * keyword_score + 0.3 * (1 if length_ok else 0) + 0.2 * (1 if has_hashtag else 0) + 0.2 * (1 if has_emoji else 0)
+
+QUALITY_KEYWORDS = ["Perfume", "gift", "holiday"]
+QUALITY_POSTS = [
+    "Holiday perfume gift sets 🎉 #HolidayGifts",     # emoji + hashtag, too short
+    "word " * 49 + "perfume",                          # exactly 50 words
+    "word " * 49,                                      # 49 words
+    "gift " * 280,                                     # exactly 280 words
+    "gift " * 281,                                     # 281 words
+    "Sparkle ✨ into the new year",                     # emoji outside the scored ranges
+    "Tag a friend # not a hashtag 😀",                 # bare '#', emoji in the 1F600 range
+    "",
+]
+
+def test_average_post_quality_empty():
+    assert average_post_quality([]) == 0.0
+
+@pytest.mark.parametrize("posts", [QUALITY_POSTS] + [[post] for post in QUALITY_POSTS])
+def test_average_post_quality_matches_baseline_mean(posts):
+    keywords_lower = [kw.lower() for kw in QUALITY_KEYWORDS]
+    features = [evaluate_social_post_features(post, keywords_lower) for post in posts]
+    expected = sum(_baseline_quality(post, QUALITY_KEYWORDS) for post in posts) / len(posts)
+    assert average_post_quality(features) == pytest.approx(expected)
@@ -4,7 +4,6 @@ from unittest.mock import AsyncMock, patch
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-from concierge_agent.agent import OrchestrationAgent
 from concierge_agent.tools import search_trends, get_sales_events
 from concierge_agent.config import ConciergeConfig
 
@@ -18,10 +17,8 @@ MOCK_EVENTS = [{'event': 'Christmas', 'promo': 'Buy1Get1 on gifts'}, {'event': '
 EXPECTED_KEYWORDS = ['perfume', 'Christmas', 'New Year', 'discount', 'bundle', 'women']
 
 @pytest.mark.asyncio
-async def test_perfume_holiday_scenario():
+async def test_perfume_holiday_scenario(agent):
     """Test full scenario: Perfume promotion for Christmas/New Year, women 25-35, US."""
-    agent = OrchestrationAgent()
-    
     user_input = "Create perfume promotion for Christmas and New Year, target 25-35 women in US"
     
     # Patch tools and sub-agents for scenario
@@ -63,9 +60,8 @@ async def test_perfume_holiday_scenario():
     mock_events.assert_called_once()
 
 @pytest.mark.asyncio
-async def test_scenario_with_validation_failure():
+async def test_scenario_with_validation_failure(agent):
     """Test scenario with refinement loop (e.g., invalid promo triggers retry)."""
-    agent = OrchestrationAgent()
     user_input = "Invalid promo test for holidays"
     
     # Mock failure in promotion, then success after retry